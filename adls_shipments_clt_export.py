@@ -16,8 +16,15 @@ Auth (pick one via env):
 - AZURE_ACCOUNT_NAME + AZURE_ACCOUNT_KEY
 - AZURE_ACCOUNT_NAME + AZURE_SAS_TOKEN   (starts with "?sv=")
 
+Optional env:
+- ADLS_CACHE_DIR   cache downloaded JSON on local disk (dev reruns)
+
 Requires:
-    pip install pandas fsspec adlfs python-dateutil
+    pip install fsspec adlfs
+Optional:
+    pip install pandas    (only for collect_events() DataFrames)
+    pip install orjson    (faster JSON parsing)
+    pip install pyarrow   (batch terminal filtering, columnar DataFrame build)
 
 Note:
 - Read-only; script only reads from ADLS and writes local CSV by default.
@@ -25,31 +32,102 @@ Note:
 
 from __future__ import annotations
 
+import io
 import os
 import re
+import csv
 import json
+import queue
+import asyncio
 import logging
+import itertools
+import threading
+import collections
 import argparse
-from datetime import datetime, date
-
-from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import functools
+import multiprocessing
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
 
-import pandas as pd
-from dateutil import parser as dateparser
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import fsspec
+from fsspec.asyn import AsyncFileSystem
+
+# pandas is only needed for collect_events(); the CLI export writes CSV with the csv module
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
 
 # Add Azure Blob Storage SDK import for optimization
 try:
+    import requests
+    from urllib3.util.retry import Retry
+    from azure.core.pipeline.transport import RequestsTransport
     from azure.storage.blob import BlobServiceClient
     AZURE_SDK_AVAILABLE = True
 except ImportError:
     AZURE_SDK_AVAILABLE = False
 
+# Async SDK client (needs aiohttp at request time): listing pages are fetched while
+# the previous page is filtered, with every date folder on one event loop
+try:
+    from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
+    AZURE_AIO_AVAILABLE = True
+except ImportError:
+    AZURE_AIO_AVAILABLE = False
+
+# orjson parses straight from bytes and is several times faster than stdlib json
+try:
+    import orjson
+    _json_loads = orjson.loads
+    ORJSON_AVAILABLE = True
+except ImportError:
+    _json_loads = json.loads
+    ORJSON_AVAILABLE = False
+
+# pyarrow parses a whole batch of JSON payloads in one multi-threaded pass
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.json as pa_json
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 
 STORAGE_PROTOCOL = "abfs"
 
+# Max number of JSON blob downloads in flight at once.
+DOWNLOAD_CONCURRENCY = 64
+# Downloads queued ahead of the parser (results are consumed in listing order).
+DOWNLOAD_WINDOW = 4 * DOWNLOAD_CONCURRENCY
+# Parallel range requests per blob for the Azure SDK download path.
+BLOB_MAX_CONCURRENCY = 4
+# Max number of directory listings in flight at once.
+LIST_CONCURRENCY = 32
+# Blob names per list page; 5000 is the service maximum.
+LIST_PAGE_SIZE = 5000
+# Pooled HTTP connections for the shared sync SDK client: every download and listing
+# thread keeps its own (requests' default of 10 drops the rest after each call).
+SDK_POOL_SIZE = DOWNLOAD_CONCURRENCY + LIST_CONCURRENCY
+# Listed paths buffered between the listing producer and the downloaders.
+LISTING_QUEUE_SIZE = 1024
+# Minimum pyarrow JSON block size; raised per batch to fit the largest payload.
+ARROW_BLOCK_SIZE = 8 << 20
+# Per-file rows are buffered and turned into one Arrow table per this many rows.
+ROW_BATCH_SIZE = 1024
+# Candidate payloads parsed per pyarrow batch.
+ARROW_BATCH_FILES = 4096
+# Candidate payloads handed to the parse worker processes per round.
+PARSE_BATCH_FILES = 1024
+# Payloads pickled to a parse worker per task.
+PARSE_CHUNKSIZE = 64
+# Records written to the CSV per chunk; the first chunk fixes the initial header.
+CSV_CHUNK_ROWS = 1000
+
 
 # --------------------------- Auth / Config ---------------------------
 # TODO: Adding an Anik Comment
@@ -61,12 +139,14 @@ class ADLSConfig:
         account_name: Optional[str] = None,
         account_key: Optional[str] = None,
         sas_token: Optional[str] = None,
+        cache_dir: Optional[str] = None,
     ) -> None:
         self.container = container
         self.connection_string = connection_string or os.getenv("AZURE_STORAGE_CONNECTION_STRING")
         self.account_name = account_name or os.getenv("AZURE_ACCOUNT_NAME")
         self.account_key = account_key or os.getenv("AZURE_ACCOUNT_KEY")
         self.sas_token = sas_token or os.getenv("AZURE_SAS_TOKEN")
+        self.cache_dir = cache_dir or os.getenv("ADLS_CACHE_DIR")
 
     @property
     def storage_options(self) -> Dict[str, str]:
@@ -82,29 +162,95 @@ class ADLSConfig:
             "or AZURE_ACCOUNT_NAME + (AZURE_ACCOUNT_KEY | AZURE_SAS_TOKEN)."
         )
 
+    @functools.cached_property
     def filesystem(self):
+        if self.cache_dir:
+            # Keep a local copy of every blob read; repeat runs are served from disk.
+            return fsspec.filesystem(
+                "simplecache",
+                target_protocol=STORAGE_PROTOCOL,
+                target_options=self.storage_options,
+                cache_storage=self.cache_dir,
+            )
         return fsspec.filesystem(STORAGE_PROTOCOL, **self.storage_options)
 
+    def _build_blob_service_client(self, client_cls, **kwargs):
+        """Sync or aio BlobServiceClient built from the same credentials used for fsspec."""
+        if self.connection_string:
+            return client_cls.from_connection_string(self.connection_string, **kwargs)
+        if self.account_name and self.account_key:
+            return client_cls(
+                account_url=f"https://{self.account_name}.blob.core.windows.net",
+                credential=self.account_key,
+                **kwargs,
+            )
+        if self.account_name and self.sas_token:
+            token = self.sas_token if self.sas_token.startswith("?") else f"?{self.sas_token}"
+            return client_cls(
+                account_url=f"https://{self.account_name}.blob.core.windows.net{token}",
+                **kwargs,
+            )
+        raise ValueError("No valid Azure credentials for direct SDK access")
+
+    @functools.cached_property
+    def blob_service_client(self) -> "BlobServiceClient":
+        return self._build_blob_service_client(BlobServiceClient, transport=_pooled_transport(SDK_POOL_SIZE))
+
+    def async_blob_service_client(self) -> "AsyncBlobServiceClient":
+        """A new aio client; not cached, since it belongs to the event loop that uses it."""
+        return self._build_blob_service_client(AsyncBlobServiceClient)
+
+    @functools.cached_property
+    def container_client(self):
+        return self.blob_service_client.get_container_client(self.container)
+
+
+def _pooled_transport(pool_size: int) -> "RequestsTransport":
+    """SDK transport over a requests session that keeps up to `pool_size` connections per host."""
+    session = requests.Session()
+    # Same adapter settings the SDK uses for its own session: retries are the pipeline's job.
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(total=False, redirect=False, raise_on_status=False),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return RequestsTransport(session=session, session_owner=True)
+
 
 def _abfs_uri(container: str, path: str) -> str:
     path = path.lstrip("/")
     return f"{STORAGE_PROTOCOL}://{container}/{path}" if path else f"{STORAGE_PROTOCOL}://{container}"
 
 
+def _blob_name(container: str, path: str) -> str:
+    """Convert an abfs URI (or fsspec 'container/...' path) to a blob name within the container."""
+    for prefix in (f"{STORAGE_PROTOCOL}://{container}/", f"{container}/"):
+        if path.startswith(prefix):
+            return path[len(prefix):]
+    return path.lstrip("/")
+
+
 # --------------------------- Helpers ---------------------------
 
-_DATE_DIR_RE = re.compile(r"^\d{4}-\d{1,2}-\d{1,2}$")  # YYYY-M-D
+_TERMINAL_KEYS = ("currentTerminal", "currentTermminal")
+_TERMINAL_KEYS_LOWER = frozenset(k.lower() for k in _TERMINAL_KEYS)
+
+# A complete current-terminal key/value pair in raw JSON (escaped values are left to the full parse).
+_TERMINAL_VALUE_RE = re.compile(rb'"currentterm{1,2}inal"\s*:\s*(?:"[^"\\]*"|null)', re.IGNORECASE)
+
+_DATE_DIR_RE = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})$")  # YYYY-M-D
 
 
 def _parse_date_dir(name: str) -> Optional[date]:
     """Return date for a folder name like '2025-8-11'; else None."""
-    if not _DATE_DIR_RE.match(name):
+    m = _DATE_DIR_RE.match(name)
+    if not m:
         return None
     try:
-        dt = dateparser.parse(name).date()
-        # quick sanity check by formatting back without leading zeros accepted
-        return dt
-    except Exception:
+        return date(int(m[1]), int(m[2]), int(m[3]))
+    except ValueError:  # e.g. '2025-13-40'
         return None
 
 
@@ -121,83 +267,324 @@ def _iter_date_dirs(fs, container: str, root: str) -> Iterator[Tuple[str, date]]
                 yield entry["name"], d  # entry["name"] is already a full abfs path
 
 
-def _get_pro_dirs(fs, date_dir_uri: str, pro_limit: Optional[int] = None) -> List[str]:
-    """Return list of immediate subdirectories (PRO IDs) under a date directory, optionally limited."""
-    pro_dirs = []
-    for entry in fs.ls(date_dir_uri, detail=True):
-        if entry.get("type") == "directory":
-            pro_dirs.append(entry["name"])
-            if pro_limit and pro_limit > 0 and len(pro_dirs) >= pro_limit:
-                break
-    return pro_dirs
+class _DateBlobGrouper:
+    """
+    Turn a sorted flat listing of blob names under `prefix` ('<date>/') into
+    (pro_dir_uri, json_path) pairs, applying the PRO/file limits client-side.
+    Names are sorted, so each PRO's blobs are contiguous and the scan can stop
+    (`done`) as soon as it reaches the PRO folder after the last one allowed.
+    Names may be fed one listing page at a time.
+    """
 
+    def __init__(
+        self,
+        container: str,
+        prefix: str,
+        pro_limit: Optional[int] = None,
+        files_limit: Optional[int] = None,
+    ) -> None:
+        self.container = container
+        self.prefix = prefix
+        self.pro_limit = pro_limit
+        self.files_limit = files_limit
+        self.done = False
+        self._current_pro = None
+        self._pros_seen = 0
+        self._files_in_pro = 0
 
-def _get_pro_dirs_optimized(cfg: 'ADLSConfig', container: str, date_path: str, pro_limit: Optional[int] = None) -> List[str]:
+    def feed(self, names: Iterable[str]) -> Iterator[Tuple[str, str]]:
+        prefix = self.prefix
+        for name in names:
+            pro, sep, file_name = name[len(prefix):].partition("/")
+            if not sep:
+                continue  # a blob directly in the date folder, not in a PRO folder
+            if pro != self._current_pro:
+                if self.pro_limit and self.pro_limit > 0 and self._pros_seen >= self.pro_limit:
+                    self.done = True
+                    return
+                self._current_pro = pro
+                self._pros_seen += 1
+                self._files_in_pro = 0
+            if "/" in file_name or not file_name.lower().endswith(".json"):
+                continue
+            if self.files_limit and self.files_limit > 0 and self._files_in_pro >= self.files_limit:
+                continue
+            self._files_in_pro += 1
+            yield _abfs_uri(self.container, prefix + pro), _abfs_uri(self.container, name)
+
+
+def _group_date_blobs(
+    container: str,
+    prefix: str,
+    names: Iterable[str],
+    pro_limit: Optional[int] = None,
+    files_limit: Optional[int] = None,
+) -> Iterator[Tuple[str, str]]:
+    """Group one complete sorted listing; see _DateBlobGrouper."""
+    return _DateBlobGrouper(container, prefix, pro_limit, files_limit).feed(names)
+
+
+def _iter_date_blobs(
+    cfg: ADLSConfig,
+    fs,
+    container: str,
+    date_dir_uri: str,
+    pro_limit: Optional[int] = None,
+    files_limit: Optional[int] = None,
+) -> Iterator[Tuple[str, str]]:
     """
-    More efficient PRO directory fetching using Azure SDK directly.
-    This allows us to limit results at the API level instead of fetching everything.
+    Yield (pro_dir_uri, json_path) for one date folder from a single flat, paginated
+    blob listing, as pages arrive.
     """
-    if not AZURE_SDK_AVAILABLE or not pro_limit or pro_limit <= 0:
-        # Fall back to original fsspec method
-        fs = cfg.filesystem()
-        date_dir_uri = f"{STORAGE_PROTOCOL}://{container}/{date_path}"
-        return _get_pro_dirs(fs, date_dir_uri, pro_limit)
-    
-    try:
-        # Create BlobServiceClient using the same credentials
-        if cfg.connection_string:
-            client = BlobServiceClient.from_connection_string(cfg.connection_string)
-        elif cfg.account_name and cfg.account_key:
-            client = BlobServiceClient(
-                account_url=f"https://{cfg.account_name}.blob.core.windows.net",
-                credential=cfg.account_key
-            )
-        elif cfg.account_name and cfg.sas_token:
-            token = cfg.sas_token if cfg.sas_token.startswith("?") else f"?{cfg.sas_token}"
-            client = BlobServiceClient(
-                account_url=f"https://{cfg.account_name}.blob.core.windows.net{token}"
-            )
+    prefix = _blob_name(container, date_dir_uri).rstrip("/") + "/"
+    yielded = 0
+    if AZURE_SDK_AVAILABLE:
+        try:
+            blobs = cfg.container_client.list_blobs(name_starts_with=prefix, results_per_page=LIST_PAGE_SIZE)
+            for item in _group_date_blobs(container, prefix, (b.name for b in blobs), pro_limit, files_limit):
+                yield item
+                yielded += 1
+            return
+        except Exception as ex:
+            # Fall back to fsspec if Azure SDK approach fails
+            logging.warning("Azure SDK listing failed (%s), falling back to fsspec method", ex)
+    names = (_blob_name(container, p) for p in fs.find(_abfs_uri(container, prefix)))
+    # Same sorted sequence, so skip whatever the SDK listing already yielded.
+    yield from itertools.islice(_group_date_blobs(container, prefix, names, pro_limit, files_limit), yielded, None)
+
+
+def _produce_json_files(
+    cfg: ADLSConfig,
+    fs,
+    container: str,
+    date_dirs: List[Tuple[str, date]],
+    pro_limit: Optional[int],
+    files_limit: Optional[int],
+    outs: List["queue.Queue"],
+    stop: threading.Event,
+    log: logging.Logger,
+) -> None:
+    """
+    Producer: list date folders concurrently and push (dir_date, pro_dir_uri, json_path)
+    onto that date's queue in `outs` (aligned with `date_dirs`) as listing pages arrive,
+    then None once the date is fully listed. Returns early once `stop` is set.
+
+    Dates are started in order and at most LIST_CONCURRENCY at a time, so the date the
+    consumer is draining is always being listed (or done) while later ones fill their
+    bounded queues. With the aio SDK, all dates share one event loop and each listing
+    prefetches its next page; otherwise (or per date, on failure) dates are listed on a
+    thread pool.
+    """
+    def put(out: "queue.Queue", item) -> bool:
+        while not stop.is_set():
+            try:
+                out.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def drain(
+        out: "queue.Queue",
+        date_dir_uri: str,
+        dir_date: date,
+        n_files: int = 0,
+        pros: Optional[set] = None,
+    ) -> None:
+        # n_files > 0 resumes a date the async listing already put that many files for.
+        pros = set() if pros is None else pros
+        blobs = _iter_date_blobs(cfg, fs, container, date_dir_uri, pro_limit, files_limit)
+        for pro_dir_uri, json_path in itertools.islice(blobs, n_files, None):
+            if not put(out, (dir_date, pro_dir_uri, json_path)):
+                return
+            n_files += 1
+            pros.add(pro_dir_uri)
+        log.info("Listed %d JSON files in %d PRO directories for date %s", n_files, len(pros), dir_date.isoformat())
+        put(out, None)
+
+    async def aput(out: "queue.Queue", item) -> bool:
+        # Poll rather than block a thread: later dates may sit on full queues for a while.
+        while not stop.is_set():
+            try:
+                out.put_nowait(item)
+                return True
+            except queue.Full:
+                await asyncio.sleep(0.01)
+        return False
+
+    async def adrain(
+        client,
+        sem: asyncio.Semaphore,
+        fallback: Executor,
+        out: "queue.Queue",
+        date_dir_uri: str,
+        dir_date: date,
+    ) -> None:
+        prefix = _blob_name(container, date_dir_uri).rstrip("/") + "/"
+        grouper = _DateBlobGrouper(container, prefix, pro_limit, files_limit)
+        n_files = 0
+        pros = set()
+        async with sem:
+            try:
+                pages = client.list_blobs(name_starts_with=prefix, results_per_page=LIST_PAGE_SIZE).by_page()
+                nxt = asyncio.ensure_future(pages.__anext__())
+                try:
+                    while True:
+                        try:
+                            page = await nxt
+                        except StopAsyncIteration:
+                            break
+                        # Request the next page before filtering this one; grouping never
+                        # awaits, so yield once to let that request actually go out first.
+                        nxt = asyncio.ensure_future(pages.__anext__())
+                        await asyncio.sleep(0)
+                        names = [b.name async for b in page]
+                        for pro_dir_uri, json_path in grouper.feed(names):
+                            if not await aput(out, (dir_date, pro_dir_uri, json_path)):
+                                return
+                            n_files += 1
+                            pros.add(pro_dir_uri)
+                        if grouper.done:
+                            break
+                finally:
+                    nxt.cancel()
+            except Exception as ex:
+                log.warning("Async listing failed for %s (%s), listing synchronously", date_dir_uri, ex)
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(fallback, drain, out, date_dir_uri, dir_date, n_files, pros)
+                return
+        log.info("Listed %d JSON files in %d PRO directories for date %s", n_files, len(pros), dir_date.isoformat())
+        await aput(out, None)
+
+    async def alist_all(service) -> None:
+        sem = asyncio.Semaphore(LIST_CONCURRENCY)
+        # Fallback listings run under `sem`, so LIST_CONCURRENCY threads are always enough.
+        with ThreadPoolExecutor(max_workers=LIST_CONCURRENCY) as fallback:
+            async with service:
+                client = service.get_container_client(container)
+                try:
+                    await asyncio.gather(*(
+                        adrain(client, sem, fallback, out, uri, d) for out, (uri, d) in zip(outs, date_dirs)
+                    ))
+                except BaseException:
+                    stop.set()  # unblock listings still waiting on a full queue
+                    raise
+
+    if AZURE_AIO_AVAILABLE:
+        try:
+            service = cfg.async_blob_service_client()
+        except Exception as ex:
+            log.warning("Async Azure SDK client unavailable (%s), listing with threads", ex)
         else:
-            raise ValueError("No valid Azure credentials for direct SDK access")
-        
-        container_client = client.get_container_client(container)
-        
-        # List blobs with prefix and delimiter to get "directory-like" structure
-        # This uses Azure's pagination and we can limit results
-        pro_dirs = []
-        blob_list = container_client.walk_blobs(
-            name_starts_with=f"{date_path}/",
-            delimiter="/"
-        )
-        
-        for blob_prefix in blob_list:
-            if hasattr(blob_prefix, 'name') and blob_prefix.name.endswith('/'):
-                # This is a directory-like prefix
-                full_path = f"{STORAGE_PROTOCOL}://{container}/{blob_prefix.name.rstrip('/')}"
-                pro_dirs.append(full_path)
-                
-                if len(pro_dirs) >= pro_limit:
-                    break
-        
-        return pro_dirs
-        
-    except Exception as ex:
-        # Fall back to original method if Azure SDK approach fails
-        logging.warning(f"Azure SDK approach failed ({ex}), falling back to fsspec method")
-        fs = cfg.filesystem()
-        date_dir_uri = f"{STORAGE_PROTOCOL}://{container}/{date_path}"
-        return _get_pro_dirs(fs, date_dir_uri, pro_limit)
-
-
-def _get_json_files(fs, pro_dir_uri: str, file_limit: Optional[int] = None) -> List[str]:
-    """Return list of JSON file paths inside a PRO folder, optionally limited."""
-    json_files = []
-    for entry in fs.ls(pro_dir_uri, detail=True):
-        if entry.get("type") == "file" and entry["name"].lower().endswith(".json"):
-            json_files.append(entry["name"])
-            if file_limit and file_limit > 0 and len(json_files) >= file_limit:
-                break
-    return json_files
+            asyncio.run(alist_all(service))
+            return
+
+    with ThreadPoolExecutor(max_workers=LIST_CONCURRENCY) as executor:
+        futures = [
+            executor.submit(drain, out, date_dir_uri, dir_date)
+            for out, (date_dir_uri, dir_date) in zip(outs, date_dirs)
+        ]
+        try:
+            for fut in as_completed(futures):
+                fut.result()
+        except BaseException:
+            stop.set()  # unblock listings still waiting on a full queue
+            raise
+
+
+class BlobFetcher:
+    """
+    Concurrent blob downloads with in-flight de-duplication: callers asking for a blob
+    that is already being downloaded get the same Future instead of a second request.
+    Entries are evicted once their download completes.
+
+    Uses the shared ContainerClient when given (reusing its HTTP session), otherwise
+    the fsspec filesystem's async API on its own event loop.
+
+    With `peek_bytes` set, only the first `peek_bytes` of each blob are read first. If that
+    prefix already holds a complete current-terminal value and `needle` is not in it, the
+    blob cannot match and its Future resolves to None without a full download.
+    """
+
+    def __init__(
+        self,
+        fs,
+        container: str,
+        executor: Executor,
+        container_client=None,
+        max_concurrency: int = DOWNLOAD_CONCURRENCY,
+        peek_bytes: int = 0,
+        needle: Optional[bytes] = None,
+    ) -> None:
+        self.fs = fs
+        self.container = container
+        self.executor = executor
+        self.container_client = container_client
+        self.max_concurrency = max_concurrency
+        self.peek_bytes = peek_bytes if needle else 0
+        self.needle = needle
+        if self.peek_bytes and container_client is None and not isinstance(fs, AsyncFileSystem):
+            # e.g. the ADLS_CACHE_DIR simplecache, which fetches whole blobs into the cache anyway
+            logging.getLogger(__name__).warning(
+                "peek_bytes is ignored with a synchronous filesystem (%s); downloading whole blobs",
+                type(fs).__name__,
+            )
+            self.peek_bytes = 0
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._sem: Optional[asyncio.Semaphore] = None  # created on the fs event loop
+
+    def get(self, path: str) -> "Future[Optional[bytes]]":
+        """Future for the raw bytes of `path` (abfs URI, fsspec path or blob name); None if peeking ruled it out."""
+        name = _blob_name(self.container, path)
+        with self._lock:
+            fut = self._inflight.get(name)
+            if fut is not None:
+                return fut
+            fut = self._submit(name)
+            self._inflight[name] = fut
+        fut.add_done_callback(lambda f: self._evict(name, f))
+        return fut
+
+    def _evict(self, name: str, fut: Future) -> None:
+        with self._lock:
+            if self._inflight.get(name) is fut:
+                del self._inflight[name]
+
+    def _submit(self, name: str) -> Future:
+        if self.container_client is not None:
+            return self.executor.submit(self._download, name)
+        uri = _abfs_uri(self.container, name)
+        if isinstance(self.fs, AsyncFileSystem):
+            return asyncio.run_coroutine_threadsafe(self._cat_async(uri), self.fs.loop)
+        return self.executor.submit(self.fs.cat_file, uri)
+
+    def _peek_rules_out(self, head: bytes) -> bool:
+        """True if the blob prefix `head` shows a current terminal other than the one wanted."""
+        return self.needle not in head and _TERMINAL_VALUE_RE.search(head) is not None
+
+    def _download(self, name: str) -> Optional[bytes]:
+        if self.peek_bytes:
+            head = self.container_client.download_blob(name, offset=0, length=self.peek_bytes)
+            data = head.readall()
+            # properties.size is the size of the downloaded range here, not of the blob.
+            if len(data) < self.peek_bytes:
+                return data  # the prefix was the whole blob
+            if self._peek_rules_out(data):
+                return None
+        return self.container_client.download_blob(name, max_concurrency=BLOB_MAX_CONCURRENCY).readall()
+
+    async def _cat_async(self, uri: str) -> Optional[bytes]:
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.max_concurrency)
+        async with self._sem:
+            if self.peek_bytes:
+                data = await self.fs._cat_file(uri, start=0, end=self.peek_bytes)
+                if len(data) < self.peek_bytes:
+                    return data  # the prefix was the whole blob
+                if self._peek_rules_out(data):
+                    return None
+            return await self.fs._cat_file(uri)
 
 
 def _extract_current_terminal(payload: Dict) -> Optional[str]:
@@ -210,29 +597,414 @@ def _extract_current_terminal(payload: Dict) -> Optional[str]:
     if isinstance(data, dict):
         candidates.append(data)
 
-    keys = ["currentTerminal", "currentTermminal"]
     for obj in candidates:
         # case-sensitive first
-        for k in keys:
+        for k in _TERMINAL_KEYS:
             if k in obj:
-                return obj.get(k)
-        # then case-insensitive
-        lower_map = {k.lower(): v for k, v in obj.items()}
-        for k in [kk.lower() for kk in keys]:
-            if k in lower_map:
-                return lower_map[k]
+                return obj[k]
+        # then case-insensitive, without building a lowered copy of the dict
+        for k, v in obj.items():
+            if k.lower() in _TERMINAL_KEYS_LOWER:
+                return v
     return None
 
 
-def _normalize(payload: Dict) -> Dict:
-    """Flatten JSON to a single level dict for CSV export."""
-    # pandas.json_normalize keeps lists as lists (stringified in CSV), which is OK.
-    rec = pd.json_normalize(payload, sep=".").to_dict(orient="records")[0]
-    return rec
+def _flatten(d: Dict, prefix: str = "", out: Optional[Dict] = None) -> Dict:
+    """
+    Flatten nested dicts to a single level dict for CSV export, joining keys with '.'.
+    Lists are kept as lists (stringified in CSV), matching pandas.json_normalize.
+    """
+    if out is None:
+        out = {}
+    for k, v in d.items():
+        if isinstance(v, dict):
+            _flatten(v, f"{prefix}{k}.", out)
+        else:
+            out[f"{prefix}{k}"] = v
+    return out
+
+
+def _read_json_batch(raws: List[bytes]) -> "pa.Table":
+    """Parse many JSON documents as one NDJSON buffer with pyarrow; struct columns flattened to 'a.b'."""
+    buf = io.BytesIO()
+    for raw in raws:
+        # JSON strings cannot hold raw newlines, so this only touches whitespace.
+        buf.write(raw.replace(b"\r", b" ").replace(b"\n", b" "))
+        buf.write(b"\n")
+    read_options = pa_json.ReadOptions(block_size=max(ARROW_BLOCK_SIZE, max(len(r) for r in raws) + 1))
+
+    buf.seek(0)
+    table = pa_json.read_json(buf, read_options=read_options)
+    if table.num_rows != len(raws):
+        raise ValueError(f"expected {len(raws)} JSON objects, parsed {table.num_rows}")
+
+    while any(pa.types.is_struct(f.type) for f in table.schema):
+        table = table.flatten()
+    return table
+
+
+def _arrow_terminal_mask(table: "pa.Table", terminal: str, raws: List[bytes]) -> Optional["pa.Array"]:
+    """
+    Vectorized `_extract_current_terminal(payload) == terminal` over a flattened table.
+    Arrow cannot tell a missing key from a null value, so when a row has more than one
+    current-terminal column, or matches on any but the first, its raw payload is re-checked
+    with _extract_current_terminal. Returns None if a current-terminal column is not a string.
+    """
+    names = table.column_names
+    ordered: List[str] = []
+    for prefix in ("", "Data."):
+        for k in _TERMINAL_KEYS:
+            if prefix + k in names:
+                ordered.append(prefix + k)
+        for n in names:
+            if (n.startswith(prefix) and n[len(prefix):].lower() in _TERMINAL_KEYS_LOWER
+                    and n not in ordered):
+                ordered.append(n)
+
+    cols = []
+    for n in ordered:
+        col = table.column(n)
+        if pa.types.is_null(col.type):
+            col = col.cast(pa.string())
+        elif not pa.types.is_string(col.type):
+            return None
+        cols.append(col)
+    if not cols:
+        return pa.array([False] * table.num_rows)
+
+    hits = [pc.fill_null(pc.equal(col, terminal), False) for col in cols]
+    if len(cols) == 1:
+        return hits[0]
+    n_valid = functools.reduce(pc.add, [pc.cast(pc.is_valid(col), pa.int8()) for col in cols])
+    sure = pc.and_(hits[0], pc.equal(n_valid, 1))
+    unsure = pc.and_(functools.reduce(pc.or_, hits), pc.invert(sure))
+    mask = sure.to_pylist()
+    for i, recheck in enumerate(unsure.to_pylist()):
+        if recheck:
+            mask[i] = _extract_current_terminal(_json_loads(raws[i])) == terminal
+    return pa.array(mask, pa.bool_())
+
+
+def _arrow_match_mask(
+    candidates: List[Tuple[date, str, str, bytes]],
+    terminal: str,
+) -> Optional[List[bool]]:
+    """
+    Parse (dir_date, pro_dir_uri, json_path, raw) candidates in one pyarrow pass and return which
+    are on `terminal`. Only the current-terminal columns are used: Arrow's inferred types change
+    other values (lists of objects padded with missing keys, ints beyond int64 read as floats),
+    so matched records are still built from the raw bytes. Returns None if pyarrow cannot parse
+    the batch (bad JSON, conflicting types, a non-string current terminal); the caller then
+    checks every file itself.
+    """
+    try:
+        raws = [c[3] for c in candidates]
+        mask = _arrow_terminal_mask(_read_json_batch(raws), terminal, raws)
+    except (pa.ArrowException, ValueError):
+        return None
+    return None if mask is None else mask.to_pylist()
+
+
+class _RowBuffer:
+    """
+    Per-file rows accumulated column-wise (one list per flattened key) rather than as one
+    object per row, so a flush hands the column lists straight to Arrow/pandas. A key seen
+    for the first time gets a column backfilled with None for the rows before it.
+    Each flush appends to `parts`, in row order, an Arrow table, or a DataFrame if pyarrow
+    is missing or would change values (nested lists/objects, ints beyond int64).
+    """
+
+    def __init__(self, parts: List, batch_size: int = ROW_BATCH_SIZE) -> None:
+        self.parts = parts
+        self.batch_size = batch_size
+        self.cols: Dict[str, List] = {}
+        self.n_rows = 0
+
+    def append(self, flat: Dict) -> None:
+        cols = self.cols
+        n = self.n_rows
+        for k, v in flat.items():
+            col = cols.get(k)
+            if col is None:
+                col = cols[k] = [None] * n
+            col.append(v)
+        if len(cols) != len(flat):
+            # columns this record does not have
+            for col in cols.values():
+                if len(col) == n:
+                    col.append(None)
+        self.n_rows = n + 1
+        if PYARROW_AVAILABLE and self.n_rows >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.n_rows:
+            return
+        cols = self.cols
+        self.cols = {}
+        self.n_rows = 0
+        if PYARROW_AVAILABLE:
+            try:
+                table = pa.Table.from_pydict(cols)
+            except (pa.ArrowException, OverflowError):
+                table = None
+            # Arrow would pad lists of objects with each other's keys and retype list items.
+            if table is not None and not any(pa.types.is_nested(f.type) for f in table.schema):
+                self.parts.append(table)
+                return
+        self.parts.append(pd.DataFrame(cols, copy=False))
+
+
+def _build_frame(parts: List) -> pd.DataFrame:
+    """Concatenate accumulated Arrow tables and DataFrames into one DataFrame, keeping their order."""
+    frames: List[pd.DataFrame] = []
+    for is_frame, run in itertools.groupby(parts, key=lambda p: isinstance(p, pd.DataFrame)):
+        run = list(run)
+        if is_frame:
+            frames.extend(run)
+            continue
+        try:
+            frames.append(pa.concat_tables(run, promote_options="permissive").to_pandas(split_blocks=True))
+        except pa.ArrowException:
+            # e.g. a column that is int in one batch and string in another
+            frames.extend(t.to_pandas(split_blocks=True) for t in run)
+    return pd.concat(frames, ignore_index=True, sort=False) if frames else pd.DataFrame()
+
+
+# pd.api.types.infer_dtype result -> nullable pandas dtype
+_NULLABLE_DTYPES = {
+    "string": "string",
+    "integer": "Int64",
+    "boolean": "boolean",
+    "floating": "Float64",
+    "mixed-integer-float": "Float64",
+}
+
+
+def _apply_nullable_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Give object columns whose values are all of one kind (ignoring missing ones) the matching
+    nullable dtype: string, Int64, boolean or Float64. Other object columns are left as is.
+    """
+    for name in df.columns[df.dtypes == object]:
+        dtype = _NULLABLE_DTYPES.get(pd.api.types.infer_dtype(df[name], skipna=True))
+        if dtype is None:
+            continue
+        try:
+            df[name] = df[name].astype(dtype)
+        except (TypeError, ValueError, OverflowError):
+            pass
+    return df
 
 
 # --------------------------- Core logic ---------------------------
 
+def _iter_candidates(
+    container: str,
+    root: str,
+    start_date: str,
+    end_date: str,
+    terminal: str,
+    pro_limit: Optional[int],
+    files_limit: Optional[int],
+    log: logging.Logger,
+    peek_bytes: int = 0,
+) -> Iterator[Tuple[date, str, str, bytes]]:
+    """
+    Yield (dir_date, pro_dir_uri, json_path, raw) for JSON files in date folders within
+    [start_date, end_date] whose downloaded payload mentions `terminal`.
+
+    Listing runs in a producer thread feeding bounded per-date queues, so downloads start
+    while date folders are still being enumerated; files are yielded in date order.
+    """
+    cfg = ADLSConfig(container=container)
+    fs = cfg.filesystem
+
+    start_dt = date.fromisoformat(start_date)
+    end_dt = date.fromisoformat(end_date)
+    if end_dt < start_dt:
+        raise ValueError("end_date must be on/after start_date")
+
+    container_client = None
+    # With a local cache configured, reads must go through the (caching) filesystem.
+    if AZURE_SDK_AVAILABLE and not cfg.cache_dir:
+        try:
+            # Built once here, before any worker thread touches it.
+            container_client = cfg.container_client
+        except Exception as ex:
+            log.warning("Azure SDK client unavailable (%s), downloading via fsspec", ex)
+
+    # The terminal code as it appears as a JSON string value in the raw payload.
+    needle = f'"{terminal}"'.encode()
+
+    date_dirs = sorted(
+        (x for x in _iter_date_dirs(fs, container, root) if start_dt <= x[1] <= end_dt),
+        key=lambda x: x[1],
+    )
+
+    # One bounded queue per date, drained in date order so rows come out in date order.
+    outs: List["queue.Queue"] = [queue.Queue(maxsize=LISTING_QUEUE_SIZE) for _ in date_dirs]
+    listed = threading.Event()  # producer finished (or failed)
+    stop = threading.Event()    # consumer gone; producer should quit
+    errors: List[BaseException] = []
+
+    def produce() -> None:
+        try:
+            _produce_json_files(cfg, fs, container, date_dirs, pro_limit, files_limit, outs, stop, log)
+        except BaseException as ex:
+            errors.append(ex)
+        finally:
+            listed.set()
+
+    producer = threading.Thread(target=produce, name="adls-listing", daemon=True)
+    producer.start()
+
+    def listed_paths() -> Iterator[Tuple[date, str, str]]:
+        for out in outs:
+            while True:
+                try:
+                    item = out.get(timeout=0.1)
+                except queue.Empty:
+                    if listed.is_set() and out.empty():
+                        break  # producer stopped (or failed) before finishing this date
+                    continue
+                if item is None:
+                    break  # date fully listed
+                yield item
+
+    inflight: Deque[Tuple[date, str, str, Future]] = collections.deque()
+
+    def finish(item: Tuple[date, str, str, Future]) -> Optional[Tuple[date, str, str, bytes]]:
+        dir_date, pro_dir_uri, json_path, fut = item
+        try:
+            data = fut.result()
+        except Exception as ex:
+            log.warning("Skipping unreadable JSON: %s (%s)", json_path, ex)
+            return None
+        if data is None:
+            return None  # ruled out from its first peek_bytes
+        # Most files are for other terminals; drop them before paying for a parse.
+        if needle not in data:
+            return None
+        return dir_date, pro_dir_uri, json_path, data
+
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_CONCURRENCY) as executor:
+        fetcher = BlobFetcher(fs, container, executor, container_client, peek_bytes=peek_bytes, needle=needle)
+        try:
+            for dir_date, pro_dir_uri, json_path in listed_paths():
+                # Keep a window of downloads in flight; results come back in listing order.
+                inflight.append((dir_date, pro_dir_uri, json_path, fetcher.get(json_path)))
+                if len(inflight) >= DOWNLOAD_WINDOW:
+                    cand = finish(inflight.popleft())
+                    if cand is not None:
+                        yield cand
+            while inflight:
+                cand = finish(inflight.popleft())
+                if cand is not None:
+                    yield cand
+        finally:
+            # Before the executor exit waits: stop listing and drop downloads not yet started.
+            stop.set()
+            for _, _, _, fut in inflight:
+                fut.cancel()
+    if errors:
+        raise errors[0]
+
+
+def _filter_payload(payload, terminal: str) -> Optional[Dict]:
+    """Return the flattened payload if its current terminal is `terminal`, else None."""
+    if _extract_current_terminal(payload) != terminal:
+        return None
+    return _flatten(payload)
+
+
+def _parse_and_filter(raw_bytes: bytes, terminal: str) -> Union[Dict, None, Exception]:
+    """
+    Decode + filter + flatten one raw payload; top-level so parse worker processes can run it.
+    A decode error is returned rather than raised or logged, so the parent can log it with
+    the file path (logging is not configured in the workers).
+    """
+    try:
+        payload = _json_loads(raw_bytes)
+    except Exception as ex:
+        return ex
+    return _filter_payload(payload, terminal)
+
+
+def _add_file_meta(rec: Dict, dir_date: date, pro_dir_uri: str, json_path: str) -> Dict:
+    rec["_file_date"] = dir_date.isoformat()
+    rec["_pro_folder"] = pro_dir_uri.split("/")[-1]
+    rec["_source_path"] = json_path
+    return rec
+
+
+def _match_payload(
+    dir_date: date,
+    pro_dir_uri: str,
+    json_path: str,
+    data: bytes,
+    terminal: str,
+    log: logging.Logger,
+) -> Optional[Dict]:
+    """Parse one payload; return its flattened record if it is on `terminal`, else None."""
+    try:
+        payload = _json_loads(data)
+    except Exception as ex:
+        log.warning("Skipping unreadable JSON: %s (%s)", json_path, ex)
+        return None
+
+    rec = _filter_payload(payload, terminal)
+    if rec is None:
+        return None
+    return _add_file_meta(rec, dir_date, pro_dir_uri, json_path)
+
+
+def _parse_pool(parse_workers: int) -> Optional[ProcessPoolExecutor]:
+    """Process pool for JSON decode + flatten, or None to parse in-process."""
+    if parse_workers <= 0:
+        return None
+    # spawn, not fork: the download threads are already running when workers start.
+    return ProcessPoolExecutor(max_workers=parse_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def _match_batch_parallel(
+    batch: List[Tuple[date, str, str, bytes]],
+    terminal: str,
+    pool: ProcessPoolExecutor,
+    log: logging.Logger,
+) -> Iterator[Dict]:
+    """Parse a batch across the worker processes; file metadata is added back here, in order."""
+    parse = functools.partial(_parse_and_filter, terminal=terminal)
+    results = pool.map(parse, [cand[3] for cand in batch], chunksize=PARSE_CHUNKSIZE)
+    for (dir_date, pro_dir_uri, json_path, _), rec in zip(batch, results):
+        if isinstance(rec, Exception):
+            log.warning("Skipping unreadable JSON: %s (%s)", json_path, rec)
+        elif rec is not None:
+            yield _add_file_meta(rec, dir_date, pro_dir_uri, json_path)
+
+
+def _add_batch(
+    batch: List[Tuple[date, str, str, bytes]],
+    terminal: str,
+    rows: _RowBuffer,
+    log: logging.Logger,
+    pool: Optional[ProcessPoolExecutor] = None,
+) -> None:
+    """Parse a batch of candidates into the accumulators; pyarrow first drops those on other terminals."""
+    mask = _arrow_match_mask(batch, terminal) if PYARROW_AVAILABLE else None
+    if mask is not None:
+        batch = [cand for cand, keep in zip(batch, mask) if keep]
+
+    if pool is not None:
+        for rec in _match_batch_parallel(batch, terminal, pool, log):
+            rows.append(rec)
+        return
+    for cand in batch:
+        rec = _match_payload(*cand, terminal, log)
+        if rec is not None:
+            rows.append(rec)
+
+
 def collect_events(
     container: str,
     root: str,
@@ -242,65 +1014,136 @@ def collect_events(
     pro_limit: Optional[int] = 20,  # Default to 20 PRO folders per date
     files_limit: Optional[int] = 10,   # Default to 10 JSON files per PRO folder
     logger: Optional[logging.Logger] = None,
+    peek_bytes: int = 0,
+    parse_workers: int = 0,
 ) -> pd.DataFrame:
     """
     Scan date folders in [start_date, end_date], walk PRO subfolders, read JSON files,
     keep only those with current terminal == `terminal`. Return a normalized DataFrame.
 
-    Limits are for dev/testing convenience.
+    Limits are for dev/testing convenience. `peek_bytes` > 0 reads that many leading
+    bytes of each JSON first and skips the full download when they already show a
+    different current terminal; only use it when currentTerminal sits near the top.
+    `parse_workers` > 0 decodes the matched files in that many processes.
+
+    Object columns holding a single kind of value get pandas' nullable dtypes (string,
+    Int64, boolean, Float64), with missing values as pd.NA.
     """
+    if not PANDAS_AVAILABLE:
+        raise ImportError("collect_events() needs pandas (pip install pandas); iter_events() does not")
     log = logger or logging.getLogger(__name__)
-    cfg = ADLSConfig(container=container)
-    fs = cfg.filesystem()
 
-    start_dt = dateparser.parse(start_date).date()
-    end_dt = dateparser.parse(end_date).date()
-    if end_dt < start_dt:
-        raise ValueError("end_date must be on/after start_date")
+    parts: List = []  # Arrow tables, or DataFrames for rows pyarrow could not take, in row order
+    rows = _RowBuffer(parts)  # per-file rows, moved into `parts` every ROW_BATCH_SIZE
 
-    rows: List[Dict] = []
-    total_files = 0
+    batch: List[Tuple[date, str, str, bytes]] = []
+    candidates = _iter_candidates(
+        container, root, start_date, end_date, terminal, pro_limit, files_limit, log, peek_bytes
+    )
+    pool = _parse_pool(parse_workers)
+    try:
+        for cand in candidates:
+            batch.append(cand)
+            if len(batch) >= ARROW_BATCH_FILES:
+                _add_batch(batch, terminal, rows, log, pool)
+                batch = []
+        if batch:
+            _add_batch(batch, terminal, rows, log, pool)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
 
-    # Iterate date directories
-    for date_dir_uri, dir_date in sorted(_iter_date_dirs(fs, container, root), key=lambda x: x[1]):
-        if dir_date < start_dt or dir_date > end_dt:
-            continue
+    rows.flush()
+    df = _build_frame(parts)
+    return _apply_nullable_dtypes(df)
 
-        # Extract just the date path (e.g., "2025-8-20" from the full URI)
-        date_path = date_dir_uri.split('/')[-1] if '/' in date_dir_uri else date_dir_uri
-        
-        # Use optimized method that limits at Azure API level when possible
-        pro_dirs = _get_pro_dirs_optimized(cfg, container, date_path, pro_limit)
-        log.info("Processing %d PRO directories for date %s", len(pro_dirs), dir_date.isoformat())
-        
-        for pro_dir_uri in pro_dirs:
-
-            json_files = _get_json_files(fs, pro_dir_uri, files_limit)
-            files_count = len(json_files)
-            total_files += files_count
-            
-            if files_limit and files_limit > 0 and files_count >= files_limit:
-                log.debug("Limited to %d JSON files in PRO folder %s", files_limit, pro_dir_uri.split("/")[-1])
-            
-            for json_path in json_files:
 
-                try:
-                    with fs.open(json_path, "r") as f:
-                        payload = json.load(f)
-                except Exception as ex:
-                    log.warning("Skipping unreadable JSON: %s (%s)", json_path, ex)
-                    continue
+def iter_events(
+    container: str,
+    root: str,
+    start_date: str,
+    end_date: str,
+    terminal: str = "010-CLT",
+    pro_limit: Optional[int] = 20,
+    files_limit: Optional[int] = 10,
+    logger: Optional[logging.Logger] = None,
+    peek_bytes: int = 0,
+    parse_workers: int = 0,
+) -> Iterator[Dict]:
+    """
+    Same scan as collect_events, but yield each matched, flattened record as soon as it
+    is parsed instead of holding them all in memory. With `parse_workers` > 0, payloads
+    are decoded in that many processes, PARSE_BATCH_FILES at a time.
+    """
+    log = logger or logging.getLogger(__name__)
+    candidates = _iter_candidates(
+        container, root, start_date, end_date, terminal, pro_limit, files_limit, log, peek_bytes
+    )
+    pool = _parse_pool(parse_workers)
+    if pool is not None:
+        try:
+            while True:
+                batch = list(itertools.islice(candidates, PARSE_BATCH_FILES))
+                if not batch:
+                    break
+                yield from _match_batch_parallel(batch, terminal, pool, log)
+        finally:
+            pool.shutdown(cancel_futures=True)
+            candidates.close()
+        return
+    for cand in candidates:
+        rec = _match_payload(*cand, terminal, log)
+        if rec is not None:
+            yield rec
 
-                curr = _extract_current_terminal(payload)
-                if curr == terminal:
-                    rec = _normalize(payload)
-                    rec["_file_date"] = dir_date.isoformat()
-                    rec["_pro_folder"] = pro_dir_uri.split("/")[-1]
-                    rec["_source_path"] = json_path
-                    rows.append(rec)
 
-    df = pd.DataFrame(rows)
-    return df
+def _widen_csv(path: str, fieldnames: List[str]) -> None:
+    """Rewrite a CSV in place under a wider header; existing rows get '' for the new columns."""
+    tmp_path = f"{path}.tmp"
+    with open(path, "r", newline="", encoding="utf-8") as src, \
+            open(tmp_path, "w", newline="", encoding="utf-8") as dst:
+        writer = csv.DictWriter(dst, fieldnames=fieldnames, lineterminator=os.linesep)
+        writer.writeheader()
+        writer.writerows(csv.DictReader(src))
+    os.replace(tmp_path, path)
+
+
+def write_events_csv(records: Iterable[Dict], out_path: str, chunk_size: int = CSV_CHUNK_ROWS) -> int:
+    """
+    Stream records to one CSV with csv.DictWriter (the C _csv writer; no pandas) and return
+    the row count. Records are written `chunk_size` at a time; the header is the union of
+    keys in the first chunk and is widened in place if a later chunk adds columns.
+    """
+    fieldnames: List[str] = []
+    known = set()
+    f = writer = None
+    count = 0
+    records = iter(records)
+    try:
+        while True:
+            chunk = list(itertools.islice(records, chunk_size))
+            if not chunk:
+                break
+            new_keys = [k for k in dict.fromkeys(k for rec in chunk for k in rec) if k not in known]
+            fieldnames.extend(new_keys)
+            known.update(new_keys)
+            if f is None:
+                f = open(out_path, "w", newline="", encoding="utf-8")
+                writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator=os.linesep)
+                writer.writeheader()
+            elif new_keys:
+                f.close()
+                _widen_csv(out_path, fieldnames)
+                f = open(out_path, "a", newline="", encoding="utf-8")
+                writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator=os.linesep)
+            writer.writerows(chunk)
+            count += len(chunk)
+        if f is None:
+            open(out_path, "w").close()  # no records: empty CSV
+    finally:
+        if f is not None:
+            f.close()
+    return count
 
 
 def main(argv: Optional[List[str]] = None) -> int:
@@ -313,8 +1156,7 @@ def main(argv: Optional[List[str]] = None) -> int:
         default_terminal = "010-CLT"  # fallback
     
     # Default date range: 1 day ending on 2025-08-01
-    from datetime import datetime, timedelta
-    end_date_obj = datetime.strptime("2025-08-01", "%Y-%m-%d").date()
+    end_date_obj = date.fromisoformat("2025-08-01")
     start_date_obj = end_date_obj - timedelta(days=1)
     
     default_end = end_date_obj.isoformat()
@@ -329,13 +1171,20 @@ def main(argv: Optional[List[str]] = None) -> int:
     parser.add_argument("--out", default=None, help="Output CSV path (local). Defaults to auto-name in CWD.")
     parser.add_argument("--pro-limit", type=int, default=20, help="Limit number of PRO folders per date. Default: 20. Set to 0 for unlimited.")
     parser.add_argument("--files-limit", type=int, default=10, help="Limit JSON files per PRO folder. Default: 10. Set to 0 for unlimited.")
+    parser.add_argument("--peek-bytes", type=int, default=0, help="Read the first N bytes of each JSON and skip the full download when they show another terminal. Default: 0 (off).")
+    parser.add_argument("--parse-workers", type=int, nargs="?", default=0, const=os.cpu_count() or 1,
+                        help="Decode JSON in N worker processes (bare flag: one per CPU). Default: 0 (in-process).")
     parser.add_argument("--log-level", default="INFO")
     args = parser.parse_args(argv)
 
     logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.INFO),
                         format="%(asctime)s %(levelname)s %(message)s")
 
-    df = collect_events(
+    if args.out is None:
+        safe_term = args.terminal.replace("/", "-")
+        args.out = f"shipments_{safe_term}_{args.start_date}_to_{args.end_date}.csv"
+
+    records = iter_events(
         container=args.container,
         root=args.root,
         start_date=args.start_date,
@@ -343,18 +1192,16 @@ def main(argv: Optional[List[str]] = None) -> int:
         terminal=args.terminal,
         pro_limit=args.pro_limit,
         files_limit=args.files_limit,
+        peek_bytes=args.peek_bytes,
+        parse_workers=args.parse_workers,
     )
+    # Stream straight to disk so memory stays flat regardless of the date range.
+    n_rows = write_events_csv(records, args.out)
 
-    if args.out is None:
-        safe_term = args.terminal.replace("/", "-")
-        args.out = f"shipments_{safe_term}_{args.start_date}_to_{args.end_date}.csv"
-
-    if df.empty:
-        logging.warning("No matching records found. Creating an empty CSV: %s", args.out)
-        df.to_csv(args.out, index=False)
+    if n_rows == 0:
+        logging.warning("No matching records found. Created an empty CSV: %s", args.out)
     else:
-        df.to_csv(args.out, index=False)
-        logging.info("Wrote %d rows to %s", len(df), args.out)
+        logging.info("Wrote %d rows to %s", n_rows, args.out)
 
     print(args.out)
     return 0